@@ -1,14 +1,11 @@
 import streamlit as st
 import pandas as pd
-from io import StringIO, BytesIO
 import datetime
-import zipfile
 import calendar
 from snowflake.snowpark import Session
 
-from utils.data_utils import mask_code, prepare_df, split_quartil_decreto
-from utils.excel_utils import make_excel_with_headers
-from utils.doc_utils import generate_full_doc, generate_price_only_doc
+from utils.data_utils import read_generoscgm, split_quartil_decreto
+from utils.report_specs import REPORT_SPECS, render_reports
 
 # ─────────── Configurações iniciais de Streamlit ───────────
 st.set_page_config(
@@ -177,34 +174,17 @@ current_year = today.year
 current_quartil = pd.to_datetime(today).quarter
 document_name = f"{current_year}Q{current_quartil}"
 
+siglas = st.sidebar.multiselect(
+    "Secretarias:",
+    options=list(REPORT_SPECS),
+    default=["SME"],
+)
+
 uploaded = st.sidebar.file_uploader("Coloque o arquivo GENEROSCGM:", type="txt")
 if uploaded is not None:
     # ─────────── Ler e tratar o TXT enviado ───────────
-    data = uploaded.read().decode("latin-1")
-    df = pd.read_csv(
-        StringIO(data),
-        sep="@",
-        header=None,
-        decimal=",",
-        engine="python",
-    )
+    df = read_generoscgm(uploaded)
 
-    df = df.drop(df.columns[[7, 9]], axis=1)
-    df.columns = [
-        "Código do Item",
-        "Dado1",
-        "Dado2",
-        "Dado3",
-        "Ano",
-        "Unidade",
-        "Preço Atacado",
-        "Preço Varejo",
-        "Preço Praticado",
-        "Produto",
-        "Descrição",
-    ]
-    df["Código do Item"] = df["Código do Item"].apply(mask_code)
-        
     quartil_df, decreto_df = split_quartil_decreto(df)
 
     tab_quartil, tab_decreto = st.tabs(["Quartil", "Decreto (Média)"])
@@ -215,94 +195,21 @@ if uploaded is not None:
         st.header("Decreto (Média)")
         st.dataframe(decreto_df)
 
-    # ─────────── Preparar outputs para Excel e DOCX ───────────
-    quartil_out = prepare_df(quartil_df)
-    decreto_out = prepare_df(decreto_df)
-
-    texto_cabecalho = (
-        "Prefeitura da Cidade do Rio de Janeiro\n"
-        "Tabela de Preços de Mercado de Gêneros Alimentícios\n"
-        f"Validade: {validade}"
-    )
-    texto_subcabecalho = (
-        "A tabela é referência para as aquisições realizadas pelos diversos órgãos do município "
-        "e tem o preço dos itens apurado conforme estabelecido no Art. 1º do Decreto nº 51.017/2022 "
-        "e alterações, que estabelece que o preço praticado pelo município e divulgado nesta tabela "
-        "seja um preço intermediário entre os preços no mercado de atacado e de varejo."
-    )
-
-    # ─────────── Gerar bytes de cada arquivo Excel (.xlsx) ───────────
-    bytes_excel_quartil = make_excel_with_headers(
-        quartil_out,
-        sheet="Quartil",
-        text1=texto_cabecalho,
-        text2=texto_subcabecalho,
-        name="",
-    )
-    bytes_excel_quartil_praticado = make_excel_with_headers(
-        quartil_out,
-        sheet="Quartil - Praticado",
-        text1=texto_cabecalho,
-        text2=texto_subcabecalho,
-        name="preço_praticado",
-    )
-    bytes_excel_decreto = make_excel_with_headers(
-        decreto_out,
-        sheet="Decreto",
-        text1=texto_cabecalho,
-        text2=texto_subcabecalho,
-        name="",
-    )
-    bytes_excel_decreto_praticado = make_excel_with_headers(
-        decreto_out,
-        sheet="Decreto - Praticado",
-        text1=texto_cabecalho,
-        text2=texto_subcabecalho,
-        name="preço_praticado",
-    )
-
-    # ─────────── Gerar bytes de cada arquivo DOCX (.docx) ───────────
-    bytes_docx_quartil = generate_full_doc(quartil_df, validade)
-    bytes_docx_quartil_praticado = generate_price_only_doc(quartil_df, validade)
-
-    bytes_docx_decreto = generate_full_doc(decreto_df, validade)
-    bytes_docx_decreto_praticado = generate_price_only_doc(decreto_df, validade)
-
-     # ─────────── Criar ZIP em memória (BytesIO) e incluir todos os arquivos ───────────
-    zip_buffer = BytesIO()
-    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        # 1) Excel (.xlsx)
-        zf.writestr(f"Quartil - GENALIM_{document_name}.xlsx", bytes_excel_quartil)
-        zf.writestr(
-            f"Quartil - PRE_TAB_{document_name}.xlsx",
-            bytes_excel_quartil_praticado,
-        )
-        zf.writestr(f"Contrato - GENALIM_{document_name}.xlsx", bytes_excel_decreto)
-        zf.writestr(
-            f"Contrato - PRE_TAB_{document_name}.xlsx",
-            bytes_excel_decreto_praticado,
+    # ─────────── Gerar Excel e DOCX de todas as secretarias em um ZIP ───────────
+    if not siglas:
+        st.warning("Selecione ao menos uma secretaria.")
+    else:
+        zip_bytes = render_reports(
+            {"Quartil": quartil_df, "Contrato": decreto_df},
+            validade,
+            document_name,
+            siglas,
         )
 
-        # 2) DOCX (.docx)
-        zf.writestr(f"Quartil - GENALIM_{document_name}.docx", bytes_docx_quartil)
-        zf.writestr(
-            f"Quartil - PRE_TAB_{document_name}.docx",
-            bytes_docx_quartil_praticado,
-        )
-        zf.writestr(f"Contrato - GENALIM_{document_name}.docx", bytes_docx_decreto)
-        zf.writestr(
-            f"Contrato - PRE_TAB_{document_name}.docx",
-            bytes_docx_decreto_praticado,
+        # ─────────── Botão de download único para o ZIP com tudo dentro ───────────
+        st.download_button(
+            label="📥 Baixar todos os Relatórios (Zip)",
+            data=zip_bytes,
+            file_name=f"Relatorios_{document_name}.zip",
+            mime="application/zip",
         )
-
-        
-    # Voltar o ponteiro para o início do buffer
-    zip_buffer.seek(0)
-
-    # ─────────── Botão de download único para o ZIP com tudo dentro ───────────
-    st.download_button(
-        label="📥 Baixar todos os Relatórios (Zip)",
-        data=zip_buffer,
-        file_name=f"Relatorios_{document_name}.zip",
-        mime="application/zip",
-    )
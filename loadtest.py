@@ -0,0 +1,358 @@
+"""
+Teste de carga do app: simula N analistas concorrentes rodando o app.py de
+forma headless (streamlit.testing.v1.AppTest), cada um enviando arquivos
+GENEROSCGM e de sazonalidade sintéticos. A Snowflake é substituída por uma
+sessão local em memória.
+
+Uso:
+    python loadtest.py --sessions 8 --iterations 3 --rows 500
+
+Relata vazão, p50/p95/p99 do tempo até o download, pico de RSS e falhas.
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import types
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pandas as pd
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(APP_DIR, "app.py")
+
+LABEL_GENEROSCGM = "Coloque o arquivo GENEROSCGM:"
+LABEL_SAZONALIDADE = "Atualizar tabela de sazonalidade:"
+UPLOADS_KEY = "_loadtest_uploads"
+DOWNLOAD_KEY = "_loadtest_download"
+
+MESES = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro",
+]
+OFERTAS = ["ALTA_OFERTA", "REGULAR", "BAIXA_OFERTA"]
+UNIDADES = ["KG", "UN", "L", "PCT", "CX", "DZ"]
+
+
+# ─────────── Dados sintéticos ───────────
+def make_generoscgm(rows: int, seed: int = 0) -> bytes:
+    """
+    Gera um TXT no layout GENEROSCGM (13 campos separados por "@", latin-1),
+    com itens de quartil ("89") e decreto ("90").
+    """
+    rng = random.Random(seed)
+    lines = []
+    for i in range(rows):
+        code = f"{rng.choice(['89', '90'])}{rng.randrange(10**9):09d}"
+        atacado = rng.uniform(1, 200)
+        varejo = atacado * rng.uniform(1.05, 1.5)
+        praticado = (atacado + varejo) / 2
+        fields = [
+            code,
+            str(rng.randrange(10)),
+            str(rng.randrange(10)),
+            str(rng.randrange(10)),
+            "2026",
+            rng.choice(UNIDADES),
+            f"{atacado:.2f}".replace(".", ","),
+            "",
+            f"{varejo:.2f}".replace(".", ","),
+            "",
+            f"{praticado:.2f}".replace(".", ","),
+            f"PRODUTO {i % 500}",
+            rng.choice(["", "-", "Embalagem de 1 kg", "Tipo 1, classe A"]),
+        ]
+        lines.append("@".join(fields))
+    return "\n".join(lines).encode("latin-1")
+
+
+def make_sazonalidade(rows: int, seed: int = 0) -> bytes:
+    """
+    Gera o .xlsx de sazonalidade (7 colunas), distribuindo os 12 meses entre
+    alta, regular e baixa oferta no formato "Mês/Mês".
+    """
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        meses = MESES[:]
+        rng.shuffle(meses)
+        a, b = sorted(rng.sample(range(1, 12), 2))
+        data.append([
+            f"EXT{i:05d}",
+            f"FGV{i:05d}",
+            f"ITEM {i}",
+            rng.choice(UNIDADES),
+            "/".join(meses[:a]),
+            "/".join(meses[a:b]),
+            "/".join(meses[b:]),
+        ])
+    df = pd.DataFrame(data, columns=["a", "b", "c", "d", "e", "f", "g"])
+    buf = BytesIO()
+    df.to_excel(buf, index=False)
+    return buf.getvalue()
+
+
+# ─────────── Snowflake local ───────────
+class _LocalResult:
+    def __init__(self, df):
+        self._df = df
+
+    def to_pandas(self):
+        return self._df.copy()
+
+
+class _LocalWriter:
+    def __init__(self, session, df):
+        self._session = session
+        self._df = df
+
+    def mode(self, mode):
+        return self
+
+    def save_as_table(self, name):
+        time.sleep(self._session.latency)
+        with self._session.lock:
+            self._session.tables[name] = self._df.copy()
+
+
+class _LocalDataFrame:
+    def __init__(self, session, df):
+        self.write = _LocalWriter(session, df)
+
+
+class LocalSession:
+    """
+    Substituto em memória da Session do Snowpark: "SELECT * FROM <tabela>"
+    e create_dataframe(...).write.save_as_table(...), com latência opcional.
+    """
+
+    def __init__(self, tables: dict, latency: float = 0.0):
+        self.tables = tables
+        self.latency = latency
+        self.lock = threading.Lock()
+
+    def sql(self, query):
+        time.sleep(self.latency)
+        name = query.rsplit(" ", 1)[-1]
+        with self.lock:
+            return _LocalResult(self.tables[name])
+
+    def create_dataframe(self, df):
+        return _LocalDataFrame(self, df)
+
+
+def install_local_snowflake(session: LocalSession) -> None:
+    """
+    Registra módulos "snowflake.snowpark" falsos cujo
+    Session.builder.configs(...).create() devolve a sessão local.
+    """
+    class _Builder:
+        def configs(self, _):
+            return self
+
+        def create(self):
+            return session
+
+    snowpark = types.ModuleType("snowflake.snowpark")
+    snowpark.Session = types.SimpleNamespace(builder=_Builder())
+    snowflake = types.ModuleType("snowflake")
+    snowflake.snowpark = snowpark
+    sys.modules["snowflake"] = snowflake
+    sys.modules["snowflake.snowpark"] = snowpark
+
+
+def seed_sazonalidade(rows: int) -> pd.DataFrame:
+    """
+    Tabela TB_SAZONALIDADE inicial, já pivotada como o app grava.
+    """
+    rng = random.Random(0)
+    cols = [m.upper() for m in MESES]
+    cols[2] = "MARCO"
+    data = {
+        "COD_EXT": [f"EXT{i:05d}" for i in range(rows)],
+        "COD_FGV": [f"FGV{i:05d}" for i in range(rows)],
+        "ESPEC_CLIENTE": [f"ITEM {i}" for i in range(rows)],
+        "UNIDADE": [rng.choice(UNIDADES) for _ in range(rows)],
+    }
+    for col in cols:
+        data[col] = [rng.choice(OFERTAS) for _ in range(rows)]
+    return pd.DataFrame(data)
+
+
+# ─────────── Uploads e downloads simulados ───────────
+def patch_streamlit() -> None:
+    """
+    O AppTest não simula file_uploader: cada sessão coloca os bytes dos
+    arquivos em st.session_state[UPLOADS_KEY] e o file_uploader devolve um
+    buffer novo a cada execução. O download_button guarda o ZIP gerado.
+    """
+    import streamlit as st
+    from streamlit.delta_generator import DeltaGenerator
+
+    def file_uploader(self, label, *args, **kwargs):
+        data = st.session_state.get(UPLOADS_KEY, {}).get(label)
+        if data is None:
+            return None
+        buf = BytesIO(data)
+        buf.name = label
+        return buf
+
+    original_download = DeltaGenerator.download_button
+
+    def download_button(self, label, data, *args, **kwargs):
+        st.session_state[DOWNLOAD_KEY] = data
+        return original_download(self, label, data, *args, **kwargs)
+
+    DeltaGenerator.file_uploader = file_uploader
+    DeltaGenerator.download_button = download_button
+    # st.file_uploader/st.download_button são métodos já ligados ao container principal
+    st.file_uploader = st._main.file_uploader
+    st.download_button = st._main.download_button
+
+
+def run_session(idx: int, args, generoscgm: bytes, sazonalidade: bytes) -> tuple[list, list]:
+    """
+    Um analista: abre o app, opcionalmente atualiza a sazonalidade e envia o
+    GENEROSCGM "iterations" vezes. Devolve (intervalos (início, fim) de cada
+    upload bem-sucedido, falhas); a abertura do app fica fora dos intervalos.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    intervals, failures = [], []
+    for it in range(args.iterations):
+        try:
+            at = AppTest.from_file(APP_FILE, default_timeout=args.timeout)
+            at.secrets["snowflake"] = {}
+            at.run()
+
+            uploads = {LABEL_GENEROSCGM: generoscgm}
+            if args.sazonalidade_every and (idx + it) % args.sazonalidade_every == 0:
+                uploads[LABEL_SAZONALIDADE] = sazonalidade
+            at.session_state[UPLOADS_KEY] = uploads
+
+            start = time.perf_counter()
+            at.run()
+            end = time.perf_counter()
+
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+            if DOWNLOAD_KEY not in at.session_state:
+                raise RuntimeError("botão de download não foi gerado")
+            with zipfile.ZipFile(BytesIO(at.session_state[DOWNLOAD_KEY])) as zf:
+                if zf.testzip() is not None:
+                    raise RuntimeError("ZIP corrompido")
+            intervals.append((start, end))
+        except Exception as exc:
+            failures.append(f"sessão {idx}, iteração {it}: {exc}")
+    return intervals, failures
+
+
+def busy_time(intervals: list) -> float:
+    """
+    Duração da união dos intervalos, isto é, o tempo em que havia ao menos um
+    upload em andamento (exclui aberturas do app e preparação do AppTest).
+    """
+    total, current_start, current_end = 0.0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+    if not values:
+        return float("nan")
+    k = (len(values) - 1) * p / 100
+    lo, hi = int(k), min(int(k) + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss está em KB no Linux e em bytes no macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="sessões concorrentes")
+    parser.add_argument("--iterations", type=int, default=2, help="uploads por sessão")
+    parser.add_argument("--rows", type=int, default=200, help="linhas do GENEROSCGM")
+    parser.add_argument("--sazonalidade-rows", type=int, default=200, help="linhas da sazonalidade")
+    parser.add_argument(
+        "--sazonalidade-every",
+        type=int,
+        default=4,
+        help="1 a cada N uploads também atualiza a sazonalidade (0 = nunca)",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="latência da Snowflake local (s)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="timeout por execução (s)")
+    args = parser.parse_args()
+
+    os.chdir(APP_DIR)
+    # As threads do AppTest não têm ScriptRunContext e cada execução emite
+    # avisos que encobririam o relatório. set_option força a leitura da
+    # configuração, que senão ocorreria no primeiro AppTest e voltaria o
+    # nível para o padrão "info".
+    import streamlit.config
+    import streamlit.logger
+
+    streamlit.config.set_option("logger.level", "error")
+    streamlit.logger.set_log_level("error")
+
+    session = LocalSession(
+        {"BASES_SPDO.DB_APP_RELATORIO_PCRJ.TB_SAZONALIDADE": seed_sazonalidade(args.sazonalidade_rows)},
+        latency=args.latency,
+    )
+    install_local_snowflake(session)
+    patch_streamlit()
+
+    generoscgm = make_generoscgm(args.rows)
+    sazonalidade = make_sazonalidade(args.sazonalidade_rows)
+    rss_before = peak_rss_mb()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        results = list(pool.map(
+            lambda i: run_session(i, args, generoscgm, sazonalidade),
+            range(args.sessions),
+        ))
+    wall = time.perf_counter() - start
+
+    intervals = [i for its, _ in results for i in its]
+    timings = [end - start for start, end in intervals]
+    failures = [f for _, fs in results for f in fs]
+    busy = busy_time(intervals)
+
+    print(f"Sessões: {args.sessions} x {args.iterations} uploads, {args.rows} linhas")
+    print(f"Concluídos: {len(timings)}   Falhas: {len(failures)}   Tempo total: {wall:.2f} s")
+    print(
+        f"Vazão: {len(timings) / busy if busy else 0:.2f} uploads/s "
+        f"(em {busy:.2f} s com uploads em andamento)"
+    )
+    print(
+        "Tempo até o download: "
+        f"p50 {percentile(timings, 50):.2f} s   "
+        f"p95 {percentile(timings, 95):.2f} s   "
+        f"p99 {percentile(timings, 99):.2f} s"
+    )
+    print(f"Pico de RSS: {peak_rss_mb():.0f} MB (antes da carga: {rss_before:.0f} MB)")
+    for f in failures[:10]:
+        print(f"  - {f}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+from io import BytesIO
+
+from utils.data_utils import prepare_df, read_generoscgm, split_quartil_decreto
+
+
+def _generoscgm(*linhas: str) -> BytesIO:
+    return BytesIO("\n".join(linhas).encode("latin-1"))
+
+
+def test_preco_nao_numerico_vira_vazio():
+    df = read_generoscgm(_generoscgm(
+        "89010010001@1@2@3@2026@KG@-@x@N/D@y@1234567,89@ARROZ@-",
+        "89010010002@1@2@3@2026/1@UN@1.234,56@x@ 6,665 @y@0,015@FEIJAO@Preto",
+    ))
+    quartil_df, _ = split_quartil_decreto(df)
+    out = prepare_df(quartil_df)
+
+    assert out["Preço Atacado"].tolist() == ["", ""]
+    assert out["Preço Varejo"].tolist() == ["", "6,67"]
+    assert out["Preço Praticado"].tolist() == ["1234567,89", "0,01"]
+
+
+def test_ano_mantido_como_texto():
+    df = read_generoscgm(_generoscgm(
+        "89010010001@1@2@3@2026/1@KG@1,00@x@2,00@y@1,50@ARROZ@-",
+    ))
+    assert df["Ano"].astype(str).tolist() == ["2026/1"]
@@ -1,5 +1,29 @@
 import pandas as pd
 
+# Layout do arquivo GENEROSCGM: 13 campos separados por "@", dos quais os
+# campos 7 e 9 são descartados. Cada coluna aproveitada tem um dtype explícito:
+# textos repetitivos (inclusive o ano, que pode vir como "2026/1") viram
+# "category". Os preços são lidos como texto e convertidos para float64 em
+# read_generoscgm, de modo que células como "-" ou "N/D" fiquem vazias em vez
+# de interromper a leitura (float32 não representa centavos com exatidão).
+GENEROSCGM_USECOLS = [0, 1, 2, 3, 4, 5, 6, 8, 10, 11, 12]
+GENEROSCGM_SCHEMA = {
+    "Código do Item": str,
+    "Dado1": "category",
+    "Dado2": "category",
+    "Dado3": "category",
+    "Ano": "category",
+    "Unidade": "category",
+    "Preço Atacado": str,
+    "Preço Varejo": str,
+    "Preço Praticado": str,
+    "Produto": "category",
+    "Descrição": "category",
+}
+
+PRICE_COLUMNS = ["Preço Atacado", "Preço Varejo", "Preço Praticado"]
+
+
 def mask_code(val):
     """
     Formata o código numérico como 'AAAA.BB.CCC-DD'.
@@ -8,65 +32,86 @@ def mask_code(val):
     return f"{s[:4]}.{s[4:6]}.{s[6:9]}-{s[9:]}"
 
 
-def prepare_df(df: pd.DataFrame) -> pd.DataFrame:
+def read_generoscgm(file) -> pd.DataFrame:
     """
-    Recebe o DataFrame bruto e retorna aquele com colunas:
-      ["Código do Item", "Descrição do Item", "Unidade",
-       "Preço Atacado", "Preço Varejo", "Preço Praticado"],
-    formatando preços e criando a coluna "Descrição do Item".
+    Lê o TXT GENEROSCGM (arquivo ou buffer binário em latin-1) já com as
+    colunas renomeadas, os dtypes de GENEROSCGM_SCHEMA e o código mascarado.
+    Preços que não são números (ex.: "-") viram NaN.
     """
-    df = df.copy()
-
-    def combine(r):
-        prod = str(r["Produto"])
-        desc = r["Descrição"]
-        if pd.isna(desc) or str(desc).strip() in ("", "-"):
-            return prod
-        return f"{prod}\n{str(desc).strip()}"
+    df = pd.read_csv(
+        file,
+        sep="@",
+        header=None,
+        encoding="latin-1",
+        usecols=GENEROSCGM_USECOLS,
+        dtype=dict(zip(GENEROSCGM_USECOLS, GENEROSCGM_SCHEMA.values())),
+    )
+    df.columns = list(GENEROSCGM_SCHEMA)
+    df["Código do Item"] = df["Código do Item"].str.strip().map(mask_code)
+    for col in PRICE_COLUMNS:
+        df[col] = pd.to_numeric(
+            df[col].astype("string").str.strip().str.replace(",", ".", regex=False),
+            errors="coerce",
+        ).astype("float64")
+    return df
 
-    df["Descrição do Item"] = df.apply(combine, axis=1)
 
-    # Preço Atacado
-    df["Preço Atacado"] = pd.to_numeric(df["Preço Atacado"], errors="coerce")
-    df["Preço Atacado"] = df["Preço Atacado"].apply(
-        lambda x: f"{x:.2f}".replace(".", ",") if pd.notna(x) else ""
+def format_price(s: pd.Series) -> pd.Series:
+    """
+    Formata preços com duas casas e vírgula decimal; valores ausentes viram "".
+    """
+    s = pd.to_numeric(s, errors="coerce")
+    return (
+        s.map("{:.2f}".format)
+        .str.replace(".", ",", regex=False)
+        .where(s.notna(), "")
+        .astype(object)
     )
 
-    # Preço Varejo
-    df["Preço Varejo"] = pd.to_numeric(df["Preço Varejo"], errors="coerce")
-    df["Preço Varejo"] = df["Preço Varejo"].apply(
-        lambda x: f"{x:.2f}".replace(".", ",") if pd.notna(x) else ""
-    )
 
-    # Preço Praticado
-    df["Preço Praticado"] = pd.to_numeric(df["Preço Praticado"], errors="coerce")
-    df["Preço Praticado"] = df["Preço Praticado"].apply(
-        lambda x: f"{x:.2f}".replace(".", ",") if pd.notna(x) else ""
-    )
+def combine_description(df: pd.DataFrame) -> pd.Series:
+    """
+    Monta a "Descrição do Item" como "Produto\\nDescrição", usando só o
+    produto quando a descrição está vazia ou é "-".
+    """
+    prod = df["Produto"].astype(str).astype(object)
+    desc = df["Descrição"].astype(object).where(df["Descrição"].notna(), "")
+    desc = desc.astype(str).str.strip()
+    sem_desc = desc.isin(["", "-"])
+    return (prod + "\n" + desc).where(~sem_desc, prod)
 
-    return df[
-        [
-            "Código do Item",
-            "Descrição do Item",
-            "Unidade",
-            "Preço Atacado",
-            "Preço Varejo",
-            "Preço Praticado",
-        ]
-    ]
+
+def prepare_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Recebe o DataFrame bruto e retorna aquele com colunas:
+      ["Código do Item", "Descrição do Item", "Unidade",
+       "Preço Atacado", "Preço Varejo", "Preço Praticado"],
+    formatando preços e criando a coluna "Descrição do Item".
+    O DataFrame de entrada não é copiado nem alterado.
+    """
+    out = {
+        "Código do Item": df["Código do Item"],
+        "Descrição do Item": combine_description(df),
+        "Unidade": df["Unidade"],
+    }
+    for col in PRICE_COLUMNS:
+        out[col] = format_price(df[col])
+    return pd.DataFrame(out)
 
 
 def split_quartil_decreto(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
     """
-    Recebe o DataFrame original (já com colunas renomeadas), aplica mask_code  
+    Recebe o DataFrame original (já com colunas renomeadas), aplica mask_code
     e devolve dois DataFrames: um com itens que começam por "89" (quartil) e outro "90" (decreto),
     mas ajusta o prefixo "90" para "89" no DataFrame de decreto.
     """
+    codes = df["Código do Item"].astype(str)
+
     # Filtra itens que começam com "89" (quartil)
-    quartil_df = df[df["Código do Item"].astype(str).str.startswith("89")].copy().reset_index(drop=True)
+    quartil_df = df[codes.str.startswith("89")].reset_index(drop=True)
 
     # Filtra itens que começam com "90" (decreto)
-    decreto_df = df[df["Código do Item"].astype(str).str.startswith("90")].copy()
+    decreto_df = df[codes.str.startswith("90")].reset_index(drop=True)
 
     # Substitui o prefixo "90" por "89" na coluna "Código do Item"
     decreto_df["Código do Item"] = (
@@ -75,6 +120,4 @@ def split_quartil_decreto(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]
         .str.replace(r"^90", "89", regex=True)
     )
 
-    decreto_df = decreto_df.reset_index(drop=True)
     return quartil_df, decreto_df
-
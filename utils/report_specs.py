@@ -0,0 +1,206 @@
+from functools import lru_cache
+from io import BytesIO
+from types import MappingProxyType
+import zipfile
+
+import pandas as pd
+
+from utils.data_utils import prepare_df
+from utils.excel_utils import make_excel_with_headers
+from utils.doc_utils import generate_doc
+
+
+# Tabelas geradas a partir do GENEROSCGM: chave = prefixo do nome do arquivo,
+# "aba" = nome da planilha no Excel.
+TABELAS = {
+    "Quartil": {"aba": "Quartil"},
+    "Contrato": {"aba": "Decreto"},
+}
+
+# Layouts de tabela. Cada coluna traz o nome no relatório, a coluna de origem
+# no DataFrame de prepare_df (None = numeração sequencial), as larguras
+# (Excel em caracteres, DOCX em cm) e o formato ("centro", "esquerda" ou "preco").
+# "espacamento_linha" define o espaçamento das células do DOCX (None = padrão do Word).
+LAYOUTS = {
+    "GENALIM": {
+        "aba": "",
+        "espacamento_linha": 1,
+        "colunas": [
+            {"nome": "Código do Item", "largura_excel": 15, "largura_docx": 5, "formato": "centro"},
+            {"nome": "Descrição do Item", "largura_excel": 60, "largura_docx": 15, "formato": "esquerda"},
+            {"nome": "Unidade", "largura_excel": 10, "largura_docx": 2, "formato": "centro"},
+            {"nome": "Preço Atacado", "largura_excel": 12, "largura_docx": 2, "formato": "preco"},
+            {"nome": "Preço Varejo", "largura_excel": 12, "largura_docx": 2, "formato": "preco"},
+            {"nome": "Preço Praticado", "largura_excel": 12, "largura_docx": 2, "formato": "preco"},
+        ],
+    },
+    "PRE_TAB": {
+        "aba": " - Praticado",
+        "espacamento_linha": None,
+        "colunas": [
+            {"nome": "Nº", "origem": None, "largura_excel": 5, "largura_docx": 1, "formato": "centro"},
+            {"nome": "Código do Item", "largura_excel": 15, "largura_docx": 5, "formato": "centro"},
+            {"nome": "Descrição do Item", "largura_excel": 60, "largura_docx": 15, "formato": "esquerda"},
+            {"nome": "Unidade", "largura_excel": 12, "largura_docx": 2, "formato": "centro"},
+            {
+                "nome": "Preço (em R$)",
+                "origem": "Preço Praticado",
+                "largura_excel": 12,
+                "largura_docx": 5,
+                "formato": "preco",
+            },
+        ],
+    },
+}
+
+# Valores comuns a todas as secretarias; cada entrada de REPORT_SPECS pode
+# sobrescrevê-los. "prefixos" restringe os itens pelo início do
+# "Código do Item" já mascarado (None = todos os itens).
+SPEC_PADRAO = {
+    "orgao": "Prefeitura da Cidade do Rio de Janeiro",
+    "titulo": "Tabela de Preços de Mercado de Gêneros Alimentícios",
+    "texto": (
+        "A tabela é referência para as aquisições realizadas pelos diversos órgãos do município "
+        "e tem o preço dos itens apurado conforme estabelecido no Art. 1º do Decreto nº 51.017/2022 "
+        "e alterações, que estabelece que o preço praticado pelo município e divulgado nesta tabela "
+        "seja um preço intermediário entre os preços no mercado de atacado e de varejo."
+    ),
+    "prefixos": None,
+    "layouts": ["GENALIM", "PRE_TAB"],
+}
+
+# Uma entrada por secretaria, mesclada sobre SPEC_PADRAO.
+REPORT_SPECS = {
+    "SME": {
+        "secretaria": "SECRETARIA DE EDUCAÇÃO",
+        "link": "http://www.rio.rj.gov.br/web/sme/pnae",
+    },
+}
+
+FORMATOS = ("centro", "esquerda", "preco")
+CAMPOS_SPEC = ("orgao", "secretaria", "link", "titulo", "texto", "prefixos", "layouts")
+CAMPOS_LAYOUT = ("aba", "colunas")
+CAMPOS_COLUNA = ("nome", "largura_excel", "largura_docx", "formato")
+
+
+def _check_fields(item: dict, campos: tuple, contexto: str) -> None:
+    faltando = [campo for campo in campos if campo not in item]
+    if faltando:
+        raise ValueError(f"{contexto}: campos obrigatórios ausentes: {', '.join(faltando)}")
+
+
+@lru_cache(maxsize=None)
+def compile_layout(nome: str) -> MappingProxyType:
+    """
+    Valida o layout e o converte para tuplas paralelas
+    (colunas, origens, larguras e formatos), prontas para os geradores.
+    O resultado é somente leitura, pois é compartilhado pelo cache.
+    """
+    if nome not in LAYOUTS:
+        raise ValueError(f"Layout desconhecido: {nome}")
+    layout = LAYOUTS[nome]
+    _check_fields(layout, CAMPOS_LAYOUT, f"Layout {nome}")
+    colunas = layout["colunas"]
+    for col in colunas:
+        _check_fields(col, CAMPOS_COLUNA, f"Layout {nome}, coluna {col.get('nome', '?')}")
+        if col["formato"] not in FORMATOS:
+            raise ValueError(f"Formato inválido na coluna {col['nome']}: {col['formato']}")
+    return MappingProxyType({
+        "nome": nome,
+        "aba": layout["aba"],
+        "espacamento_linha": layout.get("espacamento_linha"),
+        "colunas": tuple(col["nome"] for col in colunas),
+        "origens": tuple(col.get("origem", col["nome"]) for col in colunas),
+        "larguras_excel": tuple(col["largura_excel"] for col in colunas),
+        "larguras_docx": tuple(col["largura_docx"] for col in colunas),
+        "formatos": tuple(col["formato"] for col in colunas),
+    })
+
+
+@lru_cache(maxsize=None)
+def compile_spec(sigla: str) -> MappingProxyType:
+    """
+    Compila (uma única vez por processo) a especificação da secretaria,
+    mesclando-a sobre SPEC_PADRAO e resolvendo os layouts.
+    O resultado é somente leitura, pois é compartilhado pelo cache.
+    """
+    if sigla not in REPORT_SPECS:
+        raise ValueError(f"Secretaria desconhecida: {sigla}")
+    spec = {**SPEC_PADRAO, **REPORT_SPECS[sigla]}
+    _check_fields(spec, CAMPOS_SPEC, f"Secretaria {sigla}")
+    prefixos = spec["prefixos"]
+    if isinstance(prefixos, str):
+        prefixos = [prefixos]
+    return MappingProxyType({
+        "sigla": sigla,
+        "orgao": spec["orgao"],
+        "secretaria": spec["secretaria"],
+        "link": spec["link"],
+        "titulo": spec["titulo"],
+        "texto": spec["texto"],
+        "prefixos": tuple(prefixos) if prefixos else None,
+        "layouts": tuple(compile_layout(nome) for nome in spec["layouts"]),
+    })
+
+
+def build_table(df: pd.DataFrame, layout: dict, prefixos: tuple | None = None) -> pd.DataFrame:
+    """
+    Recebe o DataFrame de prepare_df e devolve só as colunas do layout,
+    já renomeadas, filtrando os itens por "prefixos" quando informado.
+    """
+    if prefixos:
+        df = df[df["Código do Item"].astype(str).str.startswith(prefixos)]
+    out = {}
+    for nome, origem in zip(layout["colunas"], layout["origens"]):
+        out[nome] = range(1, len(df) + 1) if origem is None else df[origem].to_numpy()
+    return pd.DataFrame(out)
+
+
+def render_reports(
+    tabelas: dict[str, pd.DataFrame],
+    validade: str,
+    document_name: str,
+    siglas: list[str],
+) -> bytes:
+    """
+    Gera, em uma única passada, os Excel e DOCX de todas as secretarias em
+    "siglas" e devolve o ZIP em bytes. "tabelas" mapeia as chaves de TABELAS
+    para os DataFrames brutos (ex.: saída de split_quartil_decreto).
+    Cada tabela é formatada uma só vez; recortes por layout e arquivos Excel
+    idênticos são reaproveitados entre as secretarias.
+    Com mais de uma secretaria, os arquivos ficam em uma pasta por sigla.
+    """
+    specs = [compile_spec(sigla) for sigla in siglas]
+    preparadas = {arquivo: prepare_df(df) for arquivo, df in tabelas.items()}
+
+    recortes = {}
+    excels = {}
+
+    zip_buffer = BytesIO()
+    with zipfile.ZipFile(zip_buffer, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for spec in specs:
+            pasta = f"{spec['sigla']}/" if len(specs) > 1 else ""
+            texto_cabecalho = f"{spec['orgao']}\n{spec['titulo']}\nValidade: {validade}"
+            for arquivo, df in preparadas.items():
+                for layout in spec["layouts"]:
+                    chave = (arquivo, spec["prefixos"], layout["nome"])
+                    if chave not in recortes:
+                        recortes[chave] = build_table(df, layout, spec["prefixos"])
+                    tabela = recortes[chave]
+
+                    # O Excel só depende do recorte e dos textos do cabeçalho
+                    chave_excel = chave + (texto_cabecalho, spec["texto"])
+                    if chave_excel not in excels:
+                        excels[chave_excel] = make_excel_with_headers(
+                            tabela,
+                            sheet=TABELAS[arquivo]["aba"] + layout["aba"],
+                            text1=texto_cabecalho,
+                            text2=spec["texto"],
+                            layout=layout,
+                        )
+
+                    nome = f"{pasta}{arquivo} - {layout['nome']}_{document_name}"
+                    zf.writestr(f"{nome}.xlsx", excels[chave_excel])
+                    zf.writestr(f"{nome}.docx", generate_doc(tabela, validade, spec, layout))
+
+    return zip_buffer.getvalue()